@@ -1,23 +1,50 @@
 # app.py
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, abort
 from werkzeug.security import generate_password_hash, check_password_hash
-from db import init_db, SessionLocal
+from db import init_db, SessionLocal, engine
 from models import User, Organization, Candidate, Settings, ResultRecord
 from sqlalchemy.orm import joinedload
 from wallet import verify_signature_hex
 from blockchain import Blockchain
-import config, time
+from turnout import TurnoutIndex
+from projector import VoteProjector
+from profiling import RequestProfiler
+from assets import init_assets
+import config, math, os, time
 from functools import wraps
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 app.secret_key = config.SECRET_KEY
+init_assets(app)
 
 init_db()
 blockchain = Blockchain(chain_file=config.BLOCKCHAIN_FILE, difficulty=config.POW_DIFFICULTY)
+profiler = RequestProfiler()
+profiler.attach(engine)
 
 def get_db():
     return SessionLocal()
 
+def resolve_voter_orgs(voter_ids):
+    db = get_db()
+    rows = db.query(User.id, User.org_id).filter(User.id.in_(voter_ids)).all()
+    db.close()
+    return {uid: org_id for uid, org_id in rows}
+
+turnout = TurnoutIndex(org_resolver=resolve_voter_orgs)
+projector = VoteProjector(SessionLocal)
+
+def sync_projection():
+    # the chain stays the source of truth; a failed sync resumes from its high-water mark next time
+    try:
+        projector.sync(blockchain.chain)
+    except Exception:
+        app.logger.exception("Vote projection sync failed")
+
+sync_projection()
+# later syncs run on a background thread so casting a vote doesn't wait on the SQL upsert
+projector.start(lambda: blockchain.chain)
+
 def get_settings():
     s = get_db().query(Settings).first()
     return s
@@ -167,6 +194,7 @@ def admin_toggle_voting():
 @app.route("/admin/declare_results", methods=["POST"])
 @login_required
 @role_required("admin")
+@profiler.profiled
 def admin_declare_results():
     db = get_db()
     s = db.query(Settings).first()
@@ -248,6 +276,7 @@ def admin_reset_voting():
 
     # --- 3. Reset blockchain (clear blocks, transactions) ---
     blockchain.reset_chain()
+    projector.notify()
 
     # --- 4. Clear Candidates and Voters if Desired ---
     #db.query(Candidate).delete()
@@ -335,6 +364,7 @@ def voter_dashboard():
 @app.route("/voter/cast", methods=["POST"])
 @login_required
 @role_required("voter")
+@profiler.profiled
 def voter_cast():
     db = get_db()
     s = get_settings()
@@ -373,6 +403,7 @@ def voter_cast():
     }
 
     blockchain.add_new_transaction(tx)
+    projector.notify()
     flash("✅ Vote submitted successfully.", "success")
     db.close()
     return redirect(url_for("voter_dashboard"))
@@ -420,9 +451,106 @@ def results():
     )
 
 @app.route("/api/chain")
+@profiler.profiled
 def api_chain():
     return jsonify(blockchain.to_list())
 
+def parse_timestamp_arg(name):
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a unix timestamp")
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite unix timestamp")
+    return value
+
+@app.route("/api/stats/turnout")
+def api_stats_turnout():
+    try:
+        start = parse_timestamp_arg("from")
+        end = parse_timestamp_arg("to")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        bucket = int(request.args.get("bucket", "60"))
+    except ValueError:
+        return jsonify({"error": "bucket must be an integer number of seconds"}), 400
+    turnout.sync(blockchain.chain)
+    try:
+        return jsonify(turnout.query(start, end, bucket))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route("/admin/profiling")
+@login_required
+@role_required("admin")
+def admin_profiling():
+    return jsonify({
+        "enabled": profiler.enabled,
+        "sample_rate": profiler.sample_rate,
+        "keep": profiler.keep,
+        "profiles": profiler.list_profiles(),
+    })
+
+@app.route("/admin/profiling/settings", methods=["POST"])
+@login_required
+@role_required("admin")
+def admin_profiling_settings():
+    # both fields are optional: "enabled" (true/false) and "sample_rate" (0-1)
+    enabled = request.form.get("enabled")
+    if enabled is not None and enabled not in ("true", "false"):
+        return jsonify({"error": "enabled must be true or false"}), 400
+    rate = request.form.get("sample_rate")
+    if rate:
+        try:
+            rate = float(rate)
+        except ValueError:
+            rate = math.nan
+        if not math.isfinite(rate):
+            return jsonify({"error": "sample_rate must be a number between 0 and 1"}), 400
+        profiler.sample_rate = min(max(rate, 0.0), 1.0)
+    if enabled is not None:
+        profiler.enabled = enabled == "true"
+    return jsonify({"enabled": profiler.enabled, "sample_rate": profiler.sample_rate})
+
+@app.route("/admin/profiling/<profile_id>")
+@login_required
+@role_required("admin")
+def admin_profiling_download(profile_id):
+    # ?format=text shows the top functions by cumulative time; default downloads the .prof dump
+    if request.args.get("format") == "text":
+        text = profiler.render_text(profile_id)
+        if text is None:
+            abort(404)
+        return text, 200, {"Content-Type": "text/plain; charset=utf-8"}
+    path = profiler.profile_path(profile_id)
+    if not path:
+        abort(404)
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=profile_id + ".prof")
+
+@app.route("/admin/projection/rebuild", methods=["POST"])
+@login_required
+@role_required("admin")
+def admin_projection_rebuild():
+    projected = projector.rebuild(blockchain.chain)
+    return jsonify({"rebuilt": True, "blocks_projected": projected})
+
+@app.route("/admin/projection/verify")
+@login_required
+@role_required("admin")
+def admin_projection_verify():
+    sync_projection()
+    mismatched = projector.verify(blockchain.chain)
+    return jsonify({
+        "in_sync": not mismatched,
+        "mismatched_blocks": mismatched,
+        "tally": projector.tally(),
+        "turnout_by_org": {str(k): v for k, v in projector.turnout_by_org().items()},
+    })
+
 if __name__ == "__main__":
     # Allow mobile phones on same Wi-Fi to access via IP:5000
     app.run(host="0.0.0.0", port=5000, debug=True)
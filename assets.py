@@ -0,0 +1,199 @@
+# assets.py
+# Static asset pipeline. Build once per deploy with: python assets.py
+# - checks the in-repo signing script against its pinned SRI digest
+# - fingerprints every asset into static/dist/
+# - precompresses text assets (.gz, plus .br if `brotli` is installed)
+# - writes resized WebP/PNG image variants (if Pillow is installed)
+# init_assets(app) serves static/dist under /assets/ with immutable caching;
+# asset_url() falls back to the plain static file until a build exists.
+import base64, gzip, hashlib, json, mimetypes, os, shutil, sys
+from flask import abort, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_FILE = os.path.join(DIST_DIR, "manifest.json")
+CACHE_SECONDS = 365 * 24 * 3600
+
+# script -> pinned SRI digest. These scripts sign ballots: the build refuses to publish one
+# whose bytes differ, and the digest goes on the <script> tag. Update it with every edit:
+#   openssl dgst -sha384 -binary static/<script> | openssl base64 -A
+SCRIPTS = {
+    "js/ballot_signer.js": "sha384-PAYJmlpG8dA8p769V9E1DwBz+5d2bLMS7D6ncBrdAR6M1DWta8JFdgguLMatpili",
+}
+IMAGES = ["image_vote.png"]
+IMAGE_WIDTHS = [1600, 800]  # max widths; variants are never upscaled, their real width goes in the manifest
+COMPRESSIBLE = (".js", ".css", ".svg", ".json", ".html", ".txt")
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+# ---------- runtime ----------
+# manifest: logical name -> {"file": fingerprinted path in dist/, "width": pixels (images only)}
+_manifest = {}
+
+def load_manifest():
+    global _manifest
+    try:
+        with open(MANIFEST_FILE) as f:
+            _manifest = json.load(f)
+    except (OSError, ValueError):
+        _manifest = {}
+    return _manifest
+
+def has_asset(name: str) -> bool:
+    return name in _manifest
+
+def asset_width(name: str):
+    return _manifest.get(name, {}).get("width")
+
+def asset_url(name: str) -> str:
+    if name in _manifest:
+        return url_for("dist_asset", filename=_manifest[name]["file"])
+    return url_for("static", filename=name)
+
+def asset_integrity(name: str):
+    """Pinned SRI digest for signing scripts, used on the <script> tag."""
+    return SCRIPTS.get(name)
+
+def _accepted_encodings(header: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}; entries with a malformed q are ignored."""
+    prefs = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = None
+        if q is not None:
+            prefs[coding] = q
+    return prefs
+
+def _pick_encoding(header: str, available):
+    prefs = _accepted_encodings(header)
+    best, best_q = None, 0.0
+    for enc, ext in ENCODINGS:
+        q = prefs.get(enc, prefs.get("*", 0.0))
+        if ext in available and q > best_q:
+            best, best_q = (enc, ext), q
+    return best
+
+def init_assets(app):
+    load_manifest()
+    app.add_template_global(asset_url)
+    app.add_template_global(asset_width)
+    app.add_template_global(asset_integrity)
+    app.add_template_global(has_asset)
+
+    @app.route("/assets/<path:filename>")
+    def dist_asset(filename):
+        dist_dir = os.path.abspath(DIST_DIR)
+        path = safe_join(dist_dir, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        available = [ext for _, ext in ENCODINGS if os.path.isfile(path + ext)]
+        picked = _pick_encoding(request.headers.get("Accept-Encoding", ""), available)
+        served = filename + picked[1] if picked else filename
+        resp = send_from_directory(dist_dir, served, mimetype=mimetype, conditional=True)
+        if picked:
+            resp.headers["Content-Encoding"] = picked[0]
+        resp.headers["Vary"] = "Accept-Encoding"
+        resp.headers["Cache-Control"] = f"public, max-age={CACHE_SECONDS}, immutable"
+        return resp
+
+# ---------- build ----------
+def _fingerprint(src: str, name: str, manifest: dict, width: int = None):
+    with open(src, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem, ext = os.path.splitext(name)
+    out_name = f"{stem}.{digest}{ext}"
+    out_path = os.path.join(DIST_DIR, out_name)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    shutil.copyfile(src, out_path)
+    if ext in COMPRESSIBLE:
+        with gzip.open(out_path + ".gz", "wb", compresslevel=9) as f:
+            f.write(data)
+        try:
+            import brotli
+            with open(out_path + ".br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+        except ImportError:
+            pass
+    manifest[name] = {"file": out_name}
+    if width is not None:
+        manifest[name]["width"] = width
+    print(f"  {name} -> {out_name}")
+
+def _sri(data: bytes) -> str:
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+def _build_scripts(manifest: dict) -> list:
+    errors = []
+    for name, integrity in SCRIPTS.items():
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            actual = _sri(f.read())
+        if actual != integrity:
+            errors.append(f"Integrity check failed for {name}: pinned {integrity}, file is {actual}")
+            continue
+        _fingerprint(os.path.join(STATIC_DIR, name), name, manifest)
+    return errors
+
+def _image_variants(name: str, manifest: dict):
+    try:
+        from PIL import Image
+    except ImportError:
+        print("  Pillow not installed; skipping image variants")
+        return
+    stem, ext = os.path.splitext(name)
+    tmp_dir = os.path.join(DIST_DIR, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    with Image.open(os.path.join(STATIC_DIR, name)) as img:
+        widest = None
+        for i, width in enumerate(IMAGE_WIDTHS):
+            if i > 0 and width >= widest:
+                continue  # source is too small for this variant to differ from the widest one
+            variant = img if img.width <= width else img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            widest = widest or variant.width
+            suffix = "" if i == 0 else f"-{width}"
+            webp = os.path.join(tmp_dir, f"{stem}{suffix}.webp")
+            variant.save(webp, "WEBP", quality=80, method=6)
+            _fingerprint(webp, f"{stem}{suffix}.webp", manifest, variant.width)
+            if i == 0:
+                png = os.path.join(tmp_dir, f"{stem}{ext}")
+                variant.save(png, "PNG", optimize=True)
+                _fingerprint(png, name, manifest, variant.width)
+    shutil.rmtree(tmp_dir)
+
+def build() -> list:
+    """Build every asset; a failing step is reported without stopping the others."""
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+    errors = []
+    print("Building images...")
+    for name in IMAGES:
+        try:
+            _image_variants(name, manifest)
+        except OSError as e:
+            print(f"  image variants for {name} failed: {e}")
+        if name not in manifest:
+            _fingerprint(os.path.join(STATIC_DIR, name), name, manifest)
+    print("Building scripts...")
+    errors += _build_scripts(manifest)
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Wrote {MANIFEST_FILE} ({len(manifest)} assets)")
+    for err in errors:
+        print("ERROR: " + err)
+    return errors
+
+if __name__ == "__main__":
+    sys.exit(1 if build() else 0)
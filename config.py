@@ -9,4 +9,9 @@ SECRET_KEY = "5654247ef698ef8df050e6dbb84acdfb185fcbef59a3a77809ce1c689090ce767"
 # python -c "import secrets; print(secrets.token_hex(32))"
 # config.py
 BLOCKCHAIN_FILE = "blockchain_data/chain.json"
-POW_DIFFICULTY = 3  # number of leading zeros required (tune for demo)
\ No newline at end of file
+POW_DIFFICULTY = 3  # number of leading zeros required (tune for demo)
+PROJECTION_BATCH_SIZE = 500  # blocks upserted into the votes table per transaction
+# request profiling (toggled at runtime from the admin dashboard)
+PROFILING_DIR = "profiling_data"
+PROFILING_SAMPLE_RATE = 0.1  # fraction of profiled-view requests sampled while enabled
+PROFILING_KEEP = 20  # slowest N profiles kept on disk
@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey, Boolean, JSON, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -51,3 +51,26 @@ class ResultRecord(Base):
     results_data = Column(JSON)  # stores {candidate_name: votes}
     total_votes = Column(Integer)
     winner = Column(String)
+
+class Vote(Base):
+    # read-only projection of on-chain votes, maintained by projector.VoteProjector
+    __tablename__ = "votes"
+    block_index = Column(Integer, primary_key=True, autoincrement=False)
+    tx_position = Column(Integer, primary_key=True, autoincrement=False)
+    block_hash = Column(String(64), nullable=False)
+    voter_id = Column(Integer, nullable=True, index=True)
+    candidate_id = Column(Integer, nullable=False, index=True)
+    ballot_hash = Column(Text, nullable=True)  # client-supplied, so not length-bounded
+    timestamp = Column(Float(precision=53), nullable=False, index=True)
+    __table_args__ = (
+        Index("ix_votes_candidate_timestamp", "candidate_id", "timestamp"),
+        Index("ix_votes_ballot_hash", "ballot_hash", mysql_length=64),
+    )
+
+class ProjectionState(Base):
+    # high-water mark of a chain projection so it can resume where it stopped
+    __tablename__ = "projection_state"
+    name = Column(String(50), primary_key=True)
+    genesis_hash = Column(String(64), nullable=True)
+    last_block = Column(Integer, default=0, nullable=False)
+    last_hash = Column(String(64), nullable=True)
@@ -0,0 +1,135 @@
+# profiling.py
+import cProfile, io, json, os, pstats, random, re, threading, time
+from functools import wraps
+from typing import Any, Dict, List, Optional
+from flask import current_app, request
+from sqlalchemy import event
+import config
+
+class RequestProfiler:
+    """
+    Admin-toggleable request profiler.
+
+    When enabled, a `sample_rate` fraction of calls to views wrapped with
+    @profiled run under cProfile. SQL statements issued on the attached engine
+    during the request are counted and timed. Only the `keep` slowest profiles
+    are kept on disk: <id>.prof (pstats dump) plus <id>.json (metadata).
+    """
+
+    def __init__(self, store_dir: str = config.PROFILING_DIR, sample_rate: float = config.PROFILING_SAMPLE_RATE,
+                 keep: int = config.PROFILING_KEEP):
+        self.store_dir = store_dir
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.enabled = False
+        self._local = threading.local()
+        # cProfile cannot run two profilers at once on newer Pythons; sample one request at a time
+        self._busy = threading.Lock()
+        self._store_lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    # ---------- SQL capture ----------
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if getattr(self._local, "queries", None) is not None:
+            self._local.query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        queries = getattr(self._local, "queries", None)
+        if queries is not None:
+            elapsed = time.perf_counter() - self._local.query_start
+            queries.append({"statement": statement[:500], "ms": round(elapsed * 1000, 3)})
+
+    # ---------- sampling ----------
+    def profiled(self, f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or random.random() >= self.sample_rate:
+                return f(*args, **kwargs)
+            if not self._busy.acquire(blocking=False):
+                return f(*args, **kwargs)
+            try:
+                return self._run_profiled(f, args, kwargs)
+            finally:
+                self._busy.release()
+        return wrapper
+
+    def _run_profiled(self, f, args, kwargs):
+        self._local.queries = []
+        prof = cProfile.Profile()
+        start = time.perf_counter()
+        status = 500
+        try:
+            resp = prof.runcall(f, *args, **kwargs)
+            status = getattr(resp, "status_code", 200)
+            return resp
+        finally:
+            duration = time.perf_counter() - start
+            queries = self._local.queries
+            self._local.queries = None
+            # profiling must never change the response
+            try:
+                self._save(prof, f.__name__, duration, status, queries)
+            except Exception:
+                current_app.logger.exception("Saving request profile failed")
+
+    # ---------- on-disk store ----------
+    def _save(self, prof: cProfile.Profile, endpoint: str, duration: float, status: int, queries: List[Dict[str, Any]]):
+        profile_id = f"{int(time.time() * 1000)}-{endpoint}"
+        meta = {
+            "id": profile_id,
+            "endpoint": endpoint,
+            "method": request.method,
+            "path": request.path,
+            "status": status,
+            "timestamp": time.time(),
+            "duration_ms": round(duration * 1000, 3),
+            "sql_count": len(queries),
+            "sql_ms": round(sum(q["ms"] for q in queries), 3),
+            "queries": sorted(queries, key=lambda q: q["ms"], reverse=True)[:20],
+        }
+        with self._store_lock:
+            existing = self.list_profiles()
+            if len(existing) >= self.keep and existing[-1]["duration_ms"] >= meta["duration_ms"]:
+                return  # not among the slowest N
+            prof.dump_stats(os.path.join(self.store_dir, profile_id + ".prof"))
+            with open(os.path.join(self.store_dir, profile_id + ".json"), "w") as fh:
+                json.dump(meta, fh, indent=2)
+            for old in self.list_profiles()[self.keep:]:
+                self.delete(old["id"])
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Stored profile metadata, slowest first."""
+        out = []
+        for name in os.listdir(self.store_dir):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.store_dir, name)) as fh:
+                        out.append(json.load(fh))
+                except (OSError, ValueError):
+                    continue
+        return sorted(out, key=lambda m: m.get("duration_ms", 0), reverse=True)
+
+    def profile_path(self, profile_id: str) -> Optional[str]:
+        if not re.fullmatch(r"[\w-]+", profile_id):
+            return None
+        path = os.path.abspath(os.path.join(self.store_dir, profile_id + ".prof"))
+        return path if os.path.exists(path) else None
+
+    def render_text(self, profile_id: str, limit: int = 40) -> Optional[str]:
+        path = self.profile_path(profile_id)
+        if not path:
+            return None
+        buf = io.StringIO()
+        pstats.Stats(path, stream=buf).sort_stats("cumulative").print_stats(limit)
+        return buf.getvalue()
+
+    def delete(self, profile_id: str):
+        for ext in (".prof", ".json"):
+            try:
+                os.remove(os.path.join(self.store_dir, profile_id + ext))
+            except FileNotFoundError:
+                pass
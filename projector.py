@@ -0,0 +1,202 @@
+# projector.py
+import hashlib, json, logging, threading
+from typing import Dict, List
+from sqlalchemy import func
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.dialects.mysql import insert
+from models import Vote, ProjectionState, User
+import config
+
+PROJECTION_NAME = "votes"
+# errors caused by a block's own data; connection/operational errors still abort the sync and retry later
+BAD_ROW_ERRORS = (DataError, IntegrityError, ValueError, TypeError, KeyError)
+log = logging.getLogger(__name__)
+
+def block_digest(rows) -> str:
+    """sha256 over (tx_position, voter_id, candidate_id, ballot_hash, timestamp) rows in tx order."""
+    canonical = [
+        [pos, voter_id, int(candidate_id), ballot_hash, float(timestamp)]
+        for pos, voter_id, candidate_id, ballot_hash, timestamp in sorted(rows, key=lambda r: r[0])
+    ]
+    return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+
+class VoteProjector:
+    """
+    Tails the JSON blockchain and upserts every vote into the indexed `votes` table.
+
+    Progress is kept in `projection_state` (last projected block index + hash), so
+    a sync only handles blocks mined since the previous one and survives restarts.
+    If the stored high-water mark no longer matches the chain (e.g. after
+    reset_chain()), the table is truncated and rebuilt from the genesis block.
+    A block whose rows cannot be written is logged and skipped (verify() will
+    report it) rather than holding back every block after it.
+    """
+
+    def __init__(self, session_factory, batch_size: int = config.PROJECTION_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    # ---------- background worker ----------
+    def start(self, chain_source):
+        """Run sync() on a daemon thread whenever notify() is called, off the request path."""
+        def worker():
+            while True:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                try:
+                    self.sync(chain_source())
+                except Exception:
+                    log.exception("Vote projection sync failed")
+        threading.Thread(target=worker, name="vote-projector", daemon=True).start()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _load_state(self, db) -> ProjectionState:
+        state = db.query(ProjectionState).get(PROJECTION_NAME)
+        if not state:
+            state = ProjectionState(name=PROJECTION_NAME, last_block=0)
+            db.add(state)
+        return state
+
+    def _is_stale(self, state: ProjectionState, chain) -> bool:
+        if state.genesis_hash != chain[0].hash:
+            return True
+        if state.last_block >= len(chain):
+            return True
+        return chain[state.last_block].hash != state.last_hash
+
+    def sync(self, chain) -> int:
+        """Project new blocks in batched transactions. Returns the number of blocks projected."""
+        with self._lock:
+            db = self.session_factory()
+            try:
+                state = self._load_state(db)
+                if self._is_stale(state, chain):
+                    db.query(Vote).delete()
+                    state.genesis_hash = chain[0].hash
+                    state.last_block = 0
+                    state.last_hash = chain[0].hash
+                    db.commit()
+
+                projected = 0
+                start = state.last_block + 1
+                for batch_start in range(start, len(chain), self.batch_size):
+                    batch = chain[batch_start:batch_start + self.batch_size]
+                    try:
+                        self._upsert(db, batch)
+                    except BAD_ROW_ERRORS:
+                        # isolate the offending block so the rest of the batch still lands
+                        db.rollback()
+                        for b in batch:
+                            try:
+                                self._upsert(db, [b])
+                                db.commit()
+                            except BAD_ROW_ERRORS:
+                                db.rollback()
+                                log.exception("Skipping block %s: its votes could not be projected", b.index)
+                    state.last_block = batch[-1].index
+                    state.last_hash = batch[-1].hash
+                    db.commit()
+                    projected += len(batch)
+                return projected
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def _upsert(self, db, blocks):
+        rows = [
+            {
+                "block_index": b.index,
+                "tx_position": pos,
+                "block_hash": b.hash,
+                "voter_id": tx.get("voter_id"),
+                "candidate_id": int(tx["candidate_id"]),
+                "ballot_hash": tx.get("ballot_hash"),
+                "timestamp": tx.get("timestamp", b.timestamp),
+            }
+            for b in blocks
+            for pos, tx in enumerate(b.transactions)
+            if tx.get("candidate_id") is not None
+        ]
+        if not rows:
+            return
+        stmt = insert(Vote.__table__).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            block_hash=stmt.inserted.block_hash,
+            voter_id=stmt.inserted.voter_id,
+            candidate_id=stmt.inserted.candidate_id,
+            ballot_hash=stmt.inserted.ballot_hash,
+            timestamp=stmt.inserted.timestamp,
+        )
+        db.execute(stmt)
+
+    def rebuild(self, chain) -> int:
+        """Drop the high-water mark and re-project the whole chain."""
+        with self._lock:
+            db = self.session_factory()
+            state = self._load_state(db)
+            state.genesis_hash = None
+            db.commit()
+            db.close()
+        return self.sync(chain)
+
+    def tally(self) -> Dict[int, int]:
+        """{candidate_id: votes} from the projected table."""
+        db = self.session_factory()
+        rows = db.query(Vote.candidate_id, func.count()).group_by(Vote.candidate_id).all()
+        db.close()
+        return {cand: n for cand, n in rows}
+
+    def turnout_by_org(self) -> Dict[int, int]:
+        """{org_id: votes} by joining projected votes to User.org_id."""
+        db = self.session_factory()
+        rows = (
+            db.query(User.org_id, func.count(Vote.block_index))
+            .select_from(Vote)
+            .outerjoin(User, User.id == Vote.voter_id)
+            .group_by(User.org_id)
+            .all()
+        )
+        db.close()
+        return {org_id: n for org_id, n in rows}
+
+    def verify(self, chain) -> List[int]:
+        """
+        Cross-check the projection against the chain with a per-block digest of the
+        projected rows, so edits to any vote column in SQL are detected.
+        Returns the indexes of blocks whose projected rows disagree with the chain.
+        """
+        db = self.session_factory()
+        projected = {}
+        for index, block_hash, pos, voter_id, candidate_id, ballot_hash, timestamp in (
+            db.query(Vote.block_index, Vote.block_hash, Vote.tx_position, Vote.voter_id,
+                     Vote.candidate_id, Vote.ballot_hash, Vote.timestamp)
+            .all()
+        ):
+            entry = projected.setdefault(index, {"hashes": set(), "rows": []})
+            entry["hashes"].add(block_hash)
+            entry["rows"].append((pos, voter_id, candidate_id, ballot_hash, timestamp))
+        state = db.query(ProjectionState).get(PROJECTION_NAME)
+        db.close()
+
+        upto = min(state.last_block if state else 0, len(chain) - 1)
+        mismatched = []
+        for b in chain[1:upto + 1]:
+            expected = [
+                (pos, tx.get("voter_id"), tx["candidate_id"], tx.get("ballot_hash"), tx.get("timestamp", b.timestamp))
+                for pos, tx in enumerate(b.transactions)
+                if tx.get("candidate_id") is not None
+            ]
+            entry = projected.pop(b.index, None)
+            if entry is None:
+                if expected:
+                    mismatched.append(b.index)
+            elif entry["hashes"] != {b.hash} or block_digest(entry["rows"]) != block_digest(expected):
+                mismatched.append(b.index)
+        mismatched.extend(projected)  # rows for blocks the chain no longer has
+        return sorted(mismatched)
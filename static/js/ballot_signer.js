@@ -0,0 +1,195 @@
+/*
+ * ballot_signer.js
+ * Self-contained SHA-256 + secp256k1 ECDSA signing for voter_dashboard.html.
+ * Replaces elliptic.js / js-sha256 from cdnjs so polling sites work offline.
+ * Signatures use RFC 6979 deterministic nonces and are returned as raw r||s hex,
+ * which wallet.verify_signature_hex() accepts.
+ * Works over plain http (no crypto.subtle, which needs a secure context).
+ */
+(function (root) {
+  "use strict";
+
+  // ---------- SHA-256 ----------
+  const K = new Uint32Array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+  ]);
+
+  function sha256(bytes) {
+    const len = bytes.length;
+    const padded = new Uint8Array(((len + 9 + 63) >> 6) << 6);
+    padded.set(bytes);
+    padded[len] = 0x80;
+    const view = new DataView(padded.buffer);
+    view.setUint32(padded.length - 8, Math.floor(len / 0x20000000));
+    view.setUint32(padded.length - 4, (len << 3) >>> 0);
+
+    const H = new Uint32Array([
+      0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    ]);
+    const W = new Uint32Array(64);
+    const rotr = (x, n) => (x >>> n) | (x << (32 - n));
+
+    for (let off = 0; off < padded.length; off += 64) {
+      for (let i = 0; i < 16; i++) W[i] = view.getUint32(off + i * 4);
+      for (let i = 16; i < 64; i++) {
+        const s0 = rotr(W[i - 15], 7) ^ rotr(W[i - 15], 18) ^ (W[i - 15] >>> 3);
+        const s1 = rotr(W[i - 2], 17) ^ rotr(W[i - 2], 19) ^ (W[i - 2] >>> 10);
+        W[i] = (W[i - 16] + s0 + W[i - 7] + s1) >>> 0;
+      }
+      let a = H[0], b = H[1], c = H[2], d = H[3], e = H[4], f = H[5], g = H[6], h = H[7];
+      for (let i = 0; i < 64; i++) {
+        const S1 = rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25);
+        const ch = (e & f) ^ (~e & g);
+        const t1 = (h + S1 + ch + K[i] + W[i]) >>> 0;
+        const S0 = rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22);
+        const maj = (a & b) ^ (a & c) ^ (b & c);
+        const t2 = (S0 + maj) >>> 0;
+        h = g; g = f; f = e; e = (d + t1) >>> 0;
+        d = c; c = b; b = a; a = (t1 + t2) >>> 0;
+      }
+      H[0] += a; H[1] += b; H[2] += c; H[3] += d; H[4] += e; H[5] += f; H[6] += g; H[7] += h;
+    }
+    const out = new Uint8Array(32);
+    const outView = new DataView(out.buffer);
+    for (let i = 0; i < 8; i++) outView.setUint32(i * 4, H[i]);
+    return out;
+  }
+
+  function hmacSha256(key, msg) {
+    const block = new Uint8Array(64);
+    block.set(key.length > 64 ? sha256(key) : key);
+    const inner = new Uint8Array(64 + msg.length);
+    const outer = new Uint8Array(64 + 32);
+    for (let i = 0; i < 64; i++) {
+      inner[i] = block[i] ^ 0x36;
+      outer[i] = block[i] ^ 0x5c;
+    }
+    inner.set(msg, 64);
+    outer.set(sha256(inner), 64);
+    return sha256(outer);
+  }
+
+  // ---------- byte / hex helpers ----------
+  function bytesToHex(bytes) {
+    return Array.from(bytes, b => b.toString(16).padStart(2, "0")).join("");
+  }
+
+  function hexToBytes(hex) {
+    if (hex.length % 2 || /[^0-9a-fA-F]/.test(hex)) throw new Error("invalid hex string");
+    const out = new Uint8Array(hex.length / 2);
+    for (let i = 0; i < out.length; i++) out[i] = parseInt(hex.substr(i * 2, 2), 16);
+    return out;
+  }
+
+  function concat(...parts) {
+    const out = new Uint8Array(parts.reduce((n, p) => n + p.length, 0));
+    let off = 0;
+    for (const p of parts) { out.set(p, off); off += p.length; }
+    return out;
+  }
+
+  const bytesToInt = bytes => BigInt("0x" + (bytesToHex(bytes) || "0"));
+  const intToBytes = n => hexToBytes(n.toString(16).padStart(64, "0"));
+
+  // ---------- secp256k1 ----------
+  const P = 0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2fn;
+  const N = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141n;
+  const G = [
+    0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798n,
+    0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8n
+  ];
+
+  const mod = (a, m) => ((a % m) + m) % m;
+
+  function invert(a, m) {
+    let [x0, x1, r0, r1] = [0n, 1n, m, mod(a, m)];
+    while (r1 !== 0n) {
+      const q = r0 / r1;
+      [x0, x1] = [x1, x0 - q * x1];
+      [r0, r1] = [r1, r0 - q * r1];
+    }
+    return mod(x0, m);
+  }
+
+  // affine points, null = point at infinity
+  function pointAdd(p1, p2) {
+    if (p1 === null) return p2;
+    if (p2 === null) return p1;
+    const [x1, y1] = p1, [x2, y2] = p2;
+    let lambda;
+    if (x1 === x2) {
+      if (mod(y1 + y2, P) === 0n) return null;
+      lambda = mod(3n * x1 * x1 * invert(2n * y1, P), P);
+    } else {
+      lambda = mod((y2 - y1) * invert(x2 - x1, P), P);
+    }
+    const x3 = mod(lambda * lambda - x1 - x2, P);
+    return [x3, mod(lambda * (x1 - x3) - y1, P)];
+  }
+
+  function pointMul(k, point) {
+    let result = null;
+    let addend = point;
+    while (k > 0n) {
+      if (k & 1n) result = pointAdd(result, addend);
+      addend = pointAdd(addend, addend);
+      k >>= 1n;
+    }
+    return result;
+  }
+
+  // RFC 6979 section 3.2 with HMAC-SHA256 (qlen = hlen = 256)
+  function* deterministicNonces(d, h1) {
+    const x = intToBytes(d);
+    const m = intToBytes(mod(h1, N));
+    let V = new Uint8Array(32).fill(1);
+    let Kk = new Uint8Array(32);
+    Kk = hmacSha256(Kk, concat(V, [0], x, m));
+    V = hmacSha256(Kk, V);
+    Kk = hmacSha256(Kk, concat(V, [1], x, m));
+    V = hmacSha256(Kk, V);
+    while (true) {
+      V = hmacSha256(Kk, V);
+      const k = bytesToInt(V);
+      if (k >= 1n && k < N) yield k;
+      Kk = hmacSha256(Kk, concat(V, [0]));
+      V = hmacSha256(Kk, V);
+    }
+  }
+
+  function signDigestHex(privateKeyHex, digestHex) {
+    const d = bytesToInt(hexToBytes(privateKeyHex.trim()));
+    if (d < 1n || d >= N) throw new Error("private key out of range");
+    const digest = hexToBytes(digestHex);
+    if (digest.length !== 32) throw new Error("digest must be 32 bytes");
+    const e = mod(bytesToInt(digest), N);
+    for (const k of deterministicNonces(d, e)) {
+      const r = mod(pointMul(k, G)[0], N);
+      if (r === 0n) continue;
+      const s = mod(invert(k, N) * (e + r * d), N);
+      if (s === 0n) continue;
+      return r.toString(16).padStart(64, "0") + s.toString(16).padStart(64, "0");
+    }
+  }
+
+  function publicKeyHex(privateKeyHex) {
+    const [x, y] = pointMul(bytesToInt(hexToBytes(privateKeyHex.trim())), G);
+    return "04" + x.toString(16).padStart(64, "0") + y.toString(16).padStart(64, "0");
+  }
+
+  const BallotSigner = {
+    sha256Hex: text => bytesToHex(sha256(new TextEncoder().encode(text))),
+    signDigestHex,
+    publicKeyHex
+  };
+
+  if (typeof module !== "undefined" && module.exports) module.exports = BallotSigner;
+  else root.BallotSigner = BallotSigner;
+})(this);
@@ -39,3 +39,26 @@ CREATE TABLE result_records (
     total_votes INTEGER,
     winner TEXT
 );
+
+CREATE TABLE IF NOT EXISTS votes (
+  block_index INT NOT NULL,
+  tx_position INT NOT NULL,
+  block_hash VARCHAR(64) NOT NULL,
+  voter_id INT NULL,
+  candidate_id INT NOT NULL,
+  ballot_hash TEXT,
+  timestamp DOUBLE NOT NULL,
+  PRIMARY KEY (block_index, tx_position),
+  INDEX ix_votes_voter_id (voter_id),
+  INDEX ix_votes_candidate_id (candidate_id),
+  INDEX ix_votes_ballot_hash (ballot_hash(64)),
+  INDEX ix_votes_timestamp (timestamp),
+  INDEX ix_votes_candidate_timestamp (candidate_id, timestamp)
+);
+
+CREATE TABLE IF NOT EXISTS projection_state (
+  name VARCHAR(50) PRIMARY KEY,
+  genesis_hash VARCHAR(64),
+  last_block INT NOT NULL DEFAULT 0,
+  last_hash VARCHAR(64)
+);
@@ -0,0 +1,107 @@
+# turnout.py
+import math, threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, List, Optional
+
+BUCKET_SECONDS = 60  # base resolution of the index (one minute)
+
+class TurnoutIndex:
+    """
+    Incrementally maintained per-minute vote counts, overall and per organization.
+
+    The index tails the blockchain: each sync() only looks at blocks mined since
+    the previous call, so serving a query never rescans the chain. voter_id is
+    joined to User.org_id once per voter through `org_resolver`, which receives
+    a list of unseen voter ids and returns {voter_id: org_id}.
+    """
+
+    def __init__(self, org_resolver: Callable[[List[int]], Dict[int, Optional[int]]]):
+        self.org_resolver = org_resolver
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.next_block = 1          # first block not yet indexed (genesis has no votes)
+        self.genesis_hash = None     # detects reset_chain() replacing the chain
+        self.total = 0
+        self.minutes: List[int] = []             # sorted minute keys present in `overall`
+        self.overall: Dict[int, int] = {}        # minute -> votes
+        self.by_org: Dict[Optional[int], Dict[int, int]] = {}  # org_id -> minute -> votes
+        self.voter_org: Dict[int, Optional[int]] = {}
+
+    def sync(self, chain):
+        """Index any blocks appended to `chain` since the last call."""
+        with self._lock:
+            if not chain:
+                return
+            if self.genesis_hash != chain[0].hash or self.next_block > len(chain):
+                self._reset()
+                self.genesis_hash = chain[0].hash
+            new_blocks = chain[self.next_block:]
+            if not new_blocks:
+                return
+
+            txs = [(b, tx) for b in new_blocks for tx in b.transactions if tx.get("candidate_id") is not None]
+            unseen = list({tx.get("voter_id") for _, tx in txs if tx.get("voter_id") not in self.voter_org})
+            if unseen:
+                resolved = self.org_resolver(unseen)
+                for vid in unseen:
+                    self.voter_org[vid] = resolved.get(vid)
+
+            for b, tx in txs:
+                minute = int(tx.get("timestamp", b.timestamp)) // BUCKET_SECONDS * BUCKET_SECONDS
+                if minute not in self.overall:
+                    insort(self.minutes, minute)
+                    self.overall[minute] = 0
+                self.overall[minute] += 1
+                org_counts = self.by_org.setdefault(self.voter_org.get(tx.get("voter_id")), {})
+                org_counts[minute] = org_counts.get(minute, 0) + 1
+                self.total += 1
+            self.next_block = len(chain)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None, bucket: int = BUCKET_SECONDS) -> Dict:
+        """
+        Return vote counts re-bucketed to `bucket` seconds (a multiple of one minute).
+
+        The index only has minute resolution, so the window is widened to whole
+        minutes: `start` is snapped down and `end` up to a minute boundary, and the
+        window covers [from, to). The snapped bounds are returned as "from"/"to".
+        """
+        if bucket <= 0 or bucket % BUCKET_SECONDS:
+            raise ValueError(f"bucket must be a positive multiple of {BUCKET_SECONDS} seconds")
+        for name, value in (("from", start), ("to", end)):
+            if value is not None and not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite unix timestamp")
+        if start is not None:
+            start = math.floor(start / BUCKET_SECONDS) * BUCKET_SECONDS
+        if end is not None:
+            end = math.ceil(end / BUCKET_SECONDS) * BUCKET_SECONDS
+        with self._lock:
+            lo = 0 if start is None else bisect_left(self.minutes, start)
+            hi = len(self.minutes) if end is None else bisect_left(self.minutes, end)
+            window = self.minutes[lo:hi]
+
+            overall = self._rebucket(window, self.overall, bucket)
+            by_org = {}
+            for org_id, counts in self.by_org.items():
+                series = self._rebucket(window, counts, bucket)
+                if series:
+                    by_org["none" if org_id is None else str(org_id)] = series
+            return {
+                "bucket": bucket,
+                "from": start,
+                "to": end,
+                "total": sum(overall.values()),
+                "overall": overall,
+                "by_org": by_org,
+            }
+
+    @staticmethod
+    def _rebucket(minutes: Iterable[int], counts: Dict[int, int], bucket: int) -> Dict[int, int]:
+        out: Dict[int, int] = {}
+        for m in minutes:
+            n = counts.get(m)
+            if n:
+                key = m // bucket * bucket
+                out[key] = out.get(key, 0) + n
+        return out